@@ -23,7 +23,7 @@ import importlib.util
 import os
 import subprocess
 import time
-from typing import List, Dict
+from typing import List, Dict, Optional
 from datetime import datetime
 from dotenv import load_dotenv
 
@@ -211,7 +211,8 @@ class KalshiArbitrageBot:
         
         return opportunities
     
-    def scan_all_opportunities(self, limit: int = 100, auto_execute: bool = False):
+    def scan_all_opportunities(self, limit: int = 100, auto_execute: bool = False,
+                               markets: Optional[List[Dict]] = None):
         """
         Comprehensive market scan for all available trading opportunities.
         
@@ -222,6 +223,8 @@ class KalshiArbitrageBot:
         Args:
             limit: Maximum number of markets to analyze (default: 100)
             auto_execute: Enable automatic execution of profitable spread trades
+            markets: Optional markets already fetched and passed through
+                filter_markets_by_liquidity; skips this method's own fetch and filter
             
         Returns:
             Tuple containing:
@@ -231,17 +234,18 @@ class KalshiArbitrageBot:
         """
         print(f"[{datetime.now()}] Scanning {limit} markets for all opportunities...")
         
-        # Fetch markets once
-        markets = self.client.get_markets(limit=limit, status="open")
-        if not markets:
-            print("No markets found or API error.")
-            return [], [], 0
-        
-        # Filter by liquidity
-        original_count = len(markets)
-        markets = self.filter_markets_by_liquidity(markets)
-        print(f"Found {original_count} active markets. "
-              f"Filtered to {len(markets)} markets with liquidity >= ${self.min_liquidity/100:.2f}")
+        if markets is None:
+            # Fetch markets once
+            markets = self.client.get_markets(limit=limit, status="open")
+            if not markets:
+                print("No markets found or API error.")
+                return [], [], 0
+            
+            # Filter by liquidity
+            original_count = len(markets)
+            markets = self.filter_markets_by_liquidity(markets)
+            print(f"Found {original_count} active markets. "
+                  f"Filtered to {len(markets)} markets with liquidity >= ${self.min_liquidity/100:.2f}")
         
         if not markets:
             return [], [], 0
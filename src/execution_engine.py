@@ -18,32 +18,36 @@ The module provides:
     - Automated trade execution with safety controls
     - Comprehensive trade tracking and monitoring
 """
+from dataclasses import dataclass, field
 from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 from .market_api import KalshiClient
 from .cost_calculator import FeeCalculator
 
 
+@dataclass(eq=False, slots=True)
 class TradeOpportunity:
     """
     Data structure representing a spread trading opportunity.
     
     Contains all information necessary to evaluate and execute a spread trade,
     including pricing, quantities, and calculated profitability metrics.
+    Slotted but not frozen: ``_refine_with_orderbook`` resizes quantity and
+    profit in place.
     """
     
-    def __init__(self, market_ticker: str, market_title: str, side: str,
-                 buy_price: int, sell_price: int, quantity: int,
-                 gross_profit: float, net_profit: float):
-        self.market_ticker = market_ticker
-        self.market_title = market_title
-        self.side = side  # 'yes' or 'no'
-        self.buy_price = buy_price  # Price to buy at (cents)
-        self.sell_price = sell_price  # Price to sell at (cents)
-        self.quantity = quantity
-        self.gross_profit = gross_profit
-        self.net_profit = net_profit
-        self.spread = sell_price - buy_price
+    market_ticker: str
+    market_title: str
+    side: str  # 'yes' or 'no'
+    buy_price: int  # Price to buy at (cents)
+    sell_price: int  # Price to sell at (cents)
+    quantity: int
+    gross_profit: float
+    net_profit: float
+    spread: int = field(init=False)
+    
+    def __post_init__(self):
+        self.spread = self.sell_price - self.buy_price
     
     def __repr__(self):
         return (f"TradeOpportunity(ticker={self.market_ticker}, "
@@ -316,21 +320,25 @@ class TradeExecutor:
             List of TradeOpportunity objects found
         """
         all_opportunities = []
+        markets = [market for market in markets[:limit] if market.get("ticker", "")]
         
-        for market in markets[:limit]:
-            market_ticker = market.get("ticker", "")
-            if not market_ticker:
-                continue
-            
-            # Get orderbook for more accurate analysis (with rate limiting)
-            orderbook = None
+        if self.auto_execute:
+            # Trades are sized from orderbook depth, so fetch each market's book
+            # lazily, right before analyzing and executing against it; a batch
+            # prefetch would be tens of seconds stale by the last market
+            orderbooks = (self.client.get_market_orderbook(market["ticker"]) for market in markets)
+        else:
+            # Get orderbooks for more accurate analysis, fetched concurrently
+            # (the client applies rate limiting across the parallel requests)
+            orderbooks = [None] * len(markets)
             try:
-                import time
-                time.sleep(0.2)  # 200ms delay between orderbook requests
-                orderbook = self.client.get_market_orderbook(market_ticker)
+                orderbooks = self.client.get_market_orderbooks(
+                    [market["ticker"] for market in markets]
+                )
             except:
                 pass
-            
+        
+        for market, orderbook in zip(markets, orderbooks):
             opportunities = self.analyze_orderbook_spread(market, orderbook)
             
             for opp in opportunities:
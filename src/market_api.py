@@ -19,6 +19,8 @@ import json
 import hmac
 import hashlib
 import base64
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional
 from datetime import datetime
 from dotenv import load_dotenv
@@ -41,13 +43,25 @@ class KalshiClient:
         # Private Key from Kalshi account settings (can be PEM string or file path)
         self.api_secret = os.getenv("KALSHI_API_SECRET")
         self.base_url = os.getenv("KALSHI_API_BASE_URL", "https://api.elections.kalshi.com/trade-api/v2")
+        
+        # One long-lived session so every call reuses pooled keep-alive connections
+        # instead of paying a fresh TCP+TLS handshake. The pool is sized for the
+        # web UI, which issues calls concurrently from its threadpool.
         self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=20, pool_maxsize=40)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        # (connect, read) timeout in seconds applied to every request
+        self.timeout = (2.0, float(os.getenv("API_TIMEOUT", "10")))
         
         # Rate limiting configuration
         self.last_request_time = 0
         self.min_request_interval = float(os.getenv("API_MIN_INTERVAL", "0.1"))  # 100ms minimum between requests
         self.request_count = 0
         self.rate_limit_reset_time = 0
+        self._rate_lock = threading.Lock()
+        # Thread count for concurrent fetches such as get_market_orderbooks()
+        self.max_workers = int(os.getenv("API_MAX_WORKERS", "8"))
         
         # Check if credentials are set (not placeholders)
         if not self.api_key or self.api_key == "your_api_key_id_here":
@@ -102,24 +116,28 @@ class KalshiClient:
             requests.exceptions.RequestException: For API communication errors
         """
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        kwargs.setdefault("timeout", self.timeout)
         
-        # Rate limiting: ensure minimum interval between requests
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        if time_since_last < self.min_request_interval:
-            sleep_time = self.min_request_interval - time_since_last
-            time.sleep(sleep_time)
+        # Rate limiting: reserve the next send slot under the lock so concurrent
+        # callers (e.g. parallel orderbook fetches) stay min_request_interval apart
+        with self._rate_lock:
+            current_time = time.time()
+            send_time = max(current_time, self.last_request_time + self.min_request_interval)
+            
+            # Check if we're in a rate limit cooldown period
+            in_cooldown = current_time < self.rate_limit_reset_time
+            if in_cooldown:
+                send_time = max(send_time, self.rate_limit_reset_time)
+            
+            self.last_request_time = send_time
+            self.request_count += 1
         
-        # Check if we're in a rate limit cooldown period
-        if current_time < self.rate_limit_reset_time:
-            wait_time = self.rate_limit_reset_time - current_time
-            print(f"Rate limit cooldown: waiting {wait_time:.1f} seconds...")
-            time.sleep(wait_time)
+        if in_cooldown:
+            print(f"Rate limit cooldown: waiting {send_time - current_time:.1f} seconds...")
+        if send_time > current_time:
+            time.sleep(send_time - current_time)
         
         try:
-            self.last_request_time = time.time()
-            self.request_count += 1
-            
             response = self.session.request(method, url, **kwargs)
             
             # Handle rate limiting
@@ -159,6 +177,10 @@ class KalshiClient:
                 print(f"API request failed: {e}")
             raise
     
+    def close(self):
+        """Close the underlying HTTP session and release pooled connections."""
+        self.session.close()
+    
     def get_markets(self, limit: int = 100, status: str = "open") -> List[Dict]:
         """
         Retrieve active markets from the Kalshi platform.
@@ -224,6 +246,26 @@ class KalshiClient:
             print(f"Error fetching orderbook for {market_ticker}: {e}")
             return None
     
+    def get_market_orderbooks(self, market_tickers: List[str]) -> List[Optional[Dict]]:
+        """
+        Retrieve orderbooks for several markets concurrently.
+        
+        Fetches are spread over a bounded thread pool so their round-trips overlap,
+        while ``_make_request`` keeps the overall request rate within limits.
+        
+        Args:
+            market_tickers: Unique market identifiers
+        
+        Returns:
+            Orderbook dictionaries (or None on error) in the same order as the input
+        """
+        if not market_tickers:
+            return []
+        
+        max_workers = max(1, min(self.max_workers, len(market_tickers)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(self.get_market_orderbook, market_tickers))
+    
     def get_portfolio(self) -> Optional[Dict]:
         """
         Retrieve current portfolio status and position information.
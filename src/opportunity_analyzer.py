@@ -15,35 +15,37 @@ The module performs comprehensive analysis including:
     - Time-weighted profitability (profit per day)
     - Optimal trade execution recommendations
 """
+from dataclasses import dataclass, field
 from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 from dateutil import parser as date_parser
 from .cost_calculator import FeeCalculator
 
 
+@dataclass(eq=False, slots=True)
 class ArbitrageOpportunity:
     """
     Data structure representing a probability arbitrage opportunity.
     
     Contains all relevant information for evaluating and executing an arbitrage trade,
     including market details, profit calculations, and recommended trade actions.
+    Declared as a slotted dataclass: scans can hold many of these, and orjson
+    encodes them without an intermediate dict.
     """
     
-    def __init__(self, market_ticker: str, market_title: str, 
-                 total_probability: float, deviation: float,
-                 expiration_date: datetime, trades: List[Dict],
-                 gross_profit: float, net_profit: float,
-                 days_to_expiration: float):
-        self.market_ticker = market_ticker
-        self.market_title = market_title
-        self.total_probability = total_probability
-        self.deviation = deviation
-        self.expiration_date = expiration_date
-        self.trades = trades
-        self.gross_profit = gross_profit
-        self.net_profit = net_profit
-        self.days_to_expiration = days_to_expiration
-        self.profit_per_day = net_profit / max(days_to_expiration, 0.01)
+    market_ticker: str
+    market_title: str
+    total_probability: float
+    deviation: float
+    expiration_date: datetime
+    trades: List[Dict]
+    gross_profit: float
+    net_profit: float
+    days_to_expiration: float
+    profit_per_day: float = field(init=False)
+    
+    def __post_init__(self):
+        self.profit_per_day = self.net_profit / max(self.days_to_expiration, 0.01)
     
     def __repr__(self):
         return (f"ArbitrageOpportunity(ticker={self.market_ticker}, "
@@ -340,16 +342,17 @@ class ArbitrageAnalyzer:
         """
         opportunities = []
         
-        for market in markets:
-            orderbook = None
-            if client:
-                try:
-                    import time
-                    time.sleep(0.2)  # 200ms delay between orderbook requests
-                    orderbook = client.get_market_orderbook(market.get("ticker", ""))
-                except:
-                    pass
-            
+        # Fetch orderbooks concurrently; the client paces the requests itself
+        orderbooks = [None] * len(markets)
+        if client:
+            try:
+                orderbooks = client.get_market_orderbooks(
+                    [market.get("ticker", "") for market in markets]
+                )
+            except:
+                pass
+        
+        for market, orderbook in zip(markets, orderbooks):
             opportunity = self.analyze_market(market, orderbook)
             if opportunity:
                 opportunities.append(opportunity)
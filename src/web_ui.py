@@ -2,30 +2,152 @@
 
 Run with:
     uvicorn src.web_ui:app --reload --host 0.0.0.0 --port 8000
-"""
-from typing import Optional
 
-from fastapi import FastAPI
-from fastapi.responses import HTMLResponse
-from pydantic import BaseModel
+In production drop ``--reload`` and add workers instead:
+    uvicorn src.web_ui:app --host 0.0.0.0 --port 8000 --workers ${WEB_CONCURRENCY:-4} --no-access-log --loop uvloop --http httptools
+
+Set ``WEB_UI_DOCS`` to ``1``, ``true`` or ``yes`` to expose ``/docs``, ``/redoc``
+and ``/openapi.json`` while developing; any other value leaves them disabled.
+
+``bot`` and ``client`` are per-worker singletons, so settings posted to
+``/api/settings`` only reach the worker that served the request.
+
+Handlers are ``async``; the blocking ``KalshiClient`` and bot calls are pushed
+onto the threadpool with ``run_in_threadpool`` so the event loop stays free.
+"""
+import asyncio
+import hashlib
+import os
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Final, Iterator, List, Optional, Tuple
+
+import orjson
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import HTMLResponse, JSONResponse, Response, StreamingResponse
+from starlette.concurrency import run_in_threadpool
 
 from main import KalshiArbitrageBot
 from src.market_api import KalshiClient
 
 
-class SettingsPayload(BaseModel):
-    min_liquidity: Optional[int] = None
-    min_profit_per_day: Optional[float] = None
+class _ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson.
+
+    A local stand-in for FastAPI's deprecated ``ORJSONResponse``, so the app
+    keeps the faster encoder without depending on an API slated for removal.
+    """
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+class _MarketsCache:
+    """Short-lived cache of the last ``get_markets`` response.
+
+    ``/api/scan`` and ``/api/search`` are often hit within seconds of each
+    other; sharing one fetch saves a full round-trip to Kalshi. The lock also
+    makes concurrent callers wait for a single in-flight fetch rather than
+    each hitting the API.
+    """
+
+    def __init__(self):
+        self.timestamp = 0.0
+        self.limit = 0
+        self.status: Optional[str] = None
+        self.data: List[Dict] = []
+        # (market, lowercased search text) pairs for ``data``, built on the
+        # first search after each fetch and dropped when ``data`` is replaced
+        self.haystacks: Optional[List[Tuple[Dict, str]]] = None
+        self.lock = threading.Lock()
+
+    def refresh(self, limit: int, status: str, ttl: float) -> bool:
+        """Refetch unless the cached data covers ``limit``; call with ``lock`` held.
+
+        Returns False if a needed fetch failed, leaving the old entry in place.
+        """
+        age = time.monotonic() - self.timestamp
+        if age < ttl and self.status == status and limit <= self.limit:
+            return True
+        markets = client.get_markets(limit=limit, status=status)
+        if not markets:
+            # Don't cache API errors (get_markets returns [] on failure)
+            return False
+        self.timestamp = time.monotonic()
+        self.limit, self.status, self.data = limit, status, markets
+        self.haystacks = None
+        return True
+
+
+_markets_cache = _MarketsCache()
+
+
+def get_markets_cached(limit: int, status: str = "open", ttl: float = 2.0) -> List[Dict]:
+    """Return ``client.get_markets`` results, reusing a fetch younger than ``ttl`` seconds."""
+    cache = _markets_cache
+    with cache.lock:
+        if not cache.refresh(limit, status, ttl):
+            return []
+        data = cache.data
+    return data if len(data) <= limit else data[:limit]
+
+
+def get_search_haystacks_cached(limit: int, status: str = "open",
+                                ttl: float = 2.0) -> List[Tuple[Dict, str]]:
+    """Like ``get_markets_cached``, but pairs each market with its search text.
+
+    The lowercased ``title`` + ticker strings are built once per cached fetch,
+    so repeat searches within the TTL skip the rebuild at any ``limit``.
+    """
+    cache = _markets_cache
+    with cache.lock:
+        if not cache.refresh(limit, status, ttl):
+            return []
+        if cache.haystacks is None:
+            cache.haystacks = [
+                (
+                    market,
+                    f"{market.get('title') or ''}\n"
+                    f"{market.get('ticker_name') or market.get('ticker') or ''}".lower()
+                )
+                for market in cache.data
+            ]
+        haystacks = cache.haystacks
+    return haystacks if len(haystacks) <= limit else haystacks[:limit]
 
 
-client = KalshiClient()
 bot = KalshiArbitrageBot()
-app = FastAPI(title="Kalshi Arbitrage Bot UI", version="0.1.0")
-
-
-@app.get("/", response_class=HTMLResponse)
-def home():
-    return """<!doctype html>
+# Share the bot's client so the UI and scans draw from one connection pool.
+client: KalshiClient = bot.client
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Release the pooled Kalshi connections when the server shuts down
+    client.close()
+
+
+# The interactive API docs are off unless WEB_UI_DOCS is 1/true/yes; a private
+# dashboard doesn't need them and skipping them shrinks the exposed routes.
+_DOCS_ENABLED = os.getenv("WEB_UI_DOCS", "").strip().lower() in ("1", "true", "yes")
+app = FastAPI(
+    title="Kalshi Arbitrage Bot UI",
+    version="0.1.0",
+    default_response_class=_ORJSONResponse,
+    lifespan=lifespan,
+    docs_url="/docs" if _DOCS_ENABLED else None,
+    redoc_url="/redoc" if _DOCS_ENABLED else None,
+    openapi_url="/openapi.json" if _DOCS_ENABLED else None,
+)
+# Scan and search payloads repeat the same field names for every market or
+# opportunity, so they compress well; tiny responses are left untouched.
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+
+_HOME_HTML: Final[str] = """<!doctype html>
 <html lang='en'>
 <head>
   <meta charset='UTF-8'>
@@ -94,25 +216,29 @@ def home():
   </div>
 
   <script>
-    async function refreshStatus(){
-      const res = await fetch('/api/status');
-      const data = await res.json();
+    function renderStatus(data){
       const color = data.connected ? '#22c55e' : '#ef4444';
       document.getElementById('status-text').innerHTML = `<strong style='color:${color}'>${data.connected ? 'Connected' : 'Disconnected'}</strong><br>${JSON.stringify(data.details)}`;
     }
 
-    async function refreshWallet(){
-      const res = await fetch('/api/wallet');
-      const data = await res.json();
+    async function refreshStatus(){
+      const res = await fetch('/api/status');
+      renderStatus(await res.json());
+    }
+
+    function renderWallet(data){
       document.getElementById('wallet').innerHTML = data.error ? data.error : `
         <div class='stat'>Available: $${((data.available_cash ?? 0)/100).toFixed(2)}</div>
         <div class='stat'>Reserved: $${((data.reserved_cash ?? 0)/100).toFixed(2)}</div>
         <div class='stat'>Equity: $${((data.total_equity ?? 0)/100).toFixed(2)}</div>`;
     }
 
-    async function refreshOrders(){
-      const res = await fetch('/api/orders');
-      const data = await res.json();
+    async function refreshWallet(){
+      const res = await fetch('/api/wallet');
+      renderWallet(await res.json());
+    }
+
+    function renderOrders(data){
       if(!data.length){
         document.getElementById('orders').innerText = 'No recent orders (or unable to fetch).';
         return;
@@ -121,6 +247,21 @@ def home():
       document.getElementById('orders').innerHTML = `<ul>${rows}</ul>`;
     }
 
+    async function refreshOrders(){
+      const res = await fetch('/api/orders');
+      renderOrders(await res.json());
+    }
+
+    // One round trip for the initial page load; the buttons above keep using
+    // the individual endpoints.
+    async function bootstrap(){
+      const res = await fetch('/api/bootstrap');
+      const data = await res.json();
+      renderStatus(data.status);
+      renderWallet(data.wallet);
+      renderOrders(data.orders);
+    }
+
     async function runScan(){
       const limit = document.getElementById('limit').value || 50;
       const auto = document.getElementById('auto').value;
@@ -174,63 +315,145 @@ YES Bid: ${yes_bid}¢ | YES Ask: ${yes_ask}¢
 NO Bid: ${no_bid}¢ | NO Ask: ${no_ask}¢
 Liquidity: $${liquidity}
 ${'─'.repeat(60)}`;
-        }).join('\n');
+        }).join('\\n');
         document.getElementById('search-results').innerText = `Found ${data.markets.length} market(s):\n\n${results}`;
       }
     }
 
-    refreshStatus();
-    refreshWallet();
-    refreshOrders();
+    bootstrap();
   </script>
 </body></html>"""
 
+# Encoded once at import so GET / serves the same bytes without re-encoding.
+_HOME_BYTES: Final[bytes] = _HOME_HTML.encode("utf-8")
+_HOME_HEADERS: Final[Dict[str, str]] = {"Cache-Control": "public, max-age=300"}
+
+
+@app.get("/", response_class=HTMLResponse)
+async def home():
+    return HTMLResponse(content=_HOME_BYTES, headers=_HOME_HEADERS)
+
 
 @app.get("/api/status")
-def api_status():
-    return client.check_connection()
+async def api_status():
+    return await run_in_threadpool(client.check_connection)
+
+
+def _etag_response(request: Request, data) -> Response:
+    """Encode ``data`` with a content ETag, answering 304 if the client has it.
+
+    Wallet and order data rarely change between refresh clicks, so a matching
+    ``If-None-Match`` lets the browser reuse its cached copy.
+    """
+    body = orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    etag = f'W/"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@app.get("/api/bootstrap")
+async def api_bootstrap():
+    """Status, wallet and recent orders in one response for the initial page load."""
+    status, wallet, orders = await asyncio.gather(
+        run_in_threadpool(client.check_connection),
+        run_in_threadpool(client.get_wallet_summary),
+        run_in_threadpool(client.get_recent_orders, limit=25),
+    )
+    return {"status": status, "wallet": wallet, "orders": orders}
 
 
 @app.get("/api/wallet")
-def api_wallet():
-    return client.get_wallet_summary()
+async def api_wallet(request: Request):
+    wallet = await run_in_threadpool(client.get_wallet_summary)
+    return _etag_response(request, wallet)
 
 
 @app.get("/api/orders")
-def api_orders(limit: int = 25):
-    return client.get_recent_orders(limit=limit)
+async def api_orders(request: Request, limit: int = 25):
+    orders = await run_in_threadpool(client.get_recent_orders, limit=limit)
+    return _etag_response(request, orders)
+
+
+def _json_array_chunks(items: List) -> Iterator[bytes]:
+    """Yield a JSON array of ``items`` one encoded element at a time."""
+    yield b"["
+    for i, item in enumerate(items):
+        # Opportunities are dataclasses, which orjson encodes natively
+        encoded = orjson.dumps(item, option=orjson.OPT_NON_STR_KEYS)
+        yield b"," + encoded if i else encoded
+    yield b"]"
+
+
+async def _stream_scan_result(arbitrage_opps: List, trade_opps: List,
+                              executed_count: int, debug: Dict) -> AsyncIterator[bytes]:
+    """Yield the ``/api/scan`` response body as a stream of JSON fragments."""
+    yield b'{"arbitrage_opportunities":'
+    for chunk in _json_array_chunks(arbitrage_opps):
+        yield chunk
+    yield b',"trade_opportunities":'
+    for chunk in _json_array_chunks(trade_opps):
+        yield chunk
+    yield b',"executed":' + orjson.dumps(executed_count)
+    yield b',"debug":' + orjson.dumps(debug, option=orjson.OPT_NON_STR_KEYS) + b"}"
 
 
 @app.get("/api/scan")
-def api_scan(limit: int = 50, auto_execute: bool = False):
-    # Get markets to add debug info
-    markets = client.get_markets(limit=limit, status="open")
+async def api_scan(limit: int = 50, auto_execute: bool = False):
+    # Fetch and filter once; the filtered list feeds both the scan and the
+    # debug info, so the bot doesn't repeat the API call or the filter pass
+    markets = await run_in_threadpool(get_markets_cached, limit, "open")
     filtered_markets = bot.filter_markets_by_liquidity(markets) if markets else []
 
-    arbitrage_opps, trade_opps, executed_count = bot.scan_all_opportunities(
+    arbitrage_opps, trade_opps, executed_count = await run_in_threadpool(
+        bot.scan_all_opportunities,
         limit=limit,
-        auto_execute=auto_execute
+        auto_execute=auto_execute,
+        markets=filtered_markets
     )
-    return {
-        "arbitrage_opportunities": [opp.__dict__ for opp in arbitrage_opps],
-        "trade_opportunities": [opp.__dict__ for opp in trade_opps],
-        "executed": executed_count,
-        "debug": {
-            "total_markets_fetched": len(markets) if markets else 0,
-            "markets_after_liquidity_filter": len(filtered_markets),
-            "min_liquidity": bot.min_liquidity,
-            "min_profit_per_day": bot.min_profit_per_day,
-            "sample_market_fields": list(markets[0].keys()) if markets and len(markets) > 0 else []
-        }
+    debug = {
+        "total_markets_fetched": len(markets) if markets else 0,
+        "markets_after_liquidity_filter": len(filtered_markets),
+        "min_liquidity": bot.min_liquidity,
+        "min_profit_per_day": bot.min_profit_per_day,
+        "sample_market_fields": list(markets[0].keys()) if markets and len(markets) > 0 else []
     }
+    # Stream the opportunity arrays element by element so the browser can start
+    # parsing before the whole payload is encoded; the body is still one JSON
+    # document, so runScan() keeps using res.json().
+    return StreamingResponse(
+        _stream_scan_result(arbitrage_opps, trade_opps, executed_count, debug),
+        media_type="application/json"
+    )
 
 
 @app.post("/api/settings")
-def api_settings(payload: SettingsPayload):
-    if payload.min_liquidity is not None:
-        bot.min_liquidity = payload.min_liquidity
-    if payload.min_profit_per_day is not None:
-        bot.min_profit_per_day = payload.min_profit_per_day
+async def api_settings(request: Request):
+    # Two optional numbers don't warrant a Pydantic model round-trip; parse
+    # and cast them directly.
+    try:
+        payload = orjson.loads(await request.body())
+        if not isinstance(payload, dict):
+            raise TypeError("expected a JSON object")
+        min_liquidity = payload.get("min_liquidity")
+        min_profit_per_day = payload.get("min_profit_per_day")
+        if min_liquidity is not None:
+            # int() would silently truncate 12.7 to 12; reject it instead
+            if isinstance(min_liquidity, float) and not min_liquidity.is_integer():
+                raise ValueError("min_liquidity must be a whole number of cents")
+            min_liquidity = int(min_liquidity)
+        if min_profit_per_day is not None:
+            min_profit_per_day = float(min_profit_per_day)
+    except (orjson.JSONDecodeError, TypeError, ValueError) as e:
+        raise HTTPException(status_code=422, detail=f"Invalid settings payload: {e}")
+
+    if min_liquidity is not None:
+        bot.min_liquidity = min_liquidity
+    if min_profit_per_day is not None:
+        bot.min_profit_per_day = min_profit_per_day
 
     return {
         "min_liquidity": bot.min_liquidity,
@@ -239,56 +462,51 @@ def api_settings(payload: SettingsPayload):
 
 
 @app.get("/api/search")
-def api_search(query: str, limit: int = 100):
+async def api_search(query: str, limit: int = 100):
     """Search for markets by name or ticker."""
     if not query or len(query.strip()) == 0:
-        return {"error": "Query parameter is required", "markets": []}
+        return _ORJSONResponse({"error": "Query parameter is required", "markets": []})
 
     try:
-        # Get all open markets
-        all_markets = client.get_markets(limit=limit, status="open")
+        # Get all open markets, paired with their lowercased search text
+        haystacks = await run_in_threadpool(get_search_haystacks_cached, limit, "open")
 
-        if not all_markets:
-            return {"markets": [], "count": 0}
+        if not haystacks:
+            return _ORJSONResponse({"markets": [], "count": 0})
 
         # Filter markets by search query (case-insensitive)
         query_lower = query.lower().strip()
-        matching_markets = []
-
-        for market in all_markets:
-            title = market.get("title", "").lower()
-            ticker = market.get("ticker_name", market.get("ticker", "")).lower()
-
-            # Match if query appears in title or ticker
-            if query_lower in title or query_lower in ticker:
-                matching_markets.append(market)
+        matching_markets = [
+            market for market, haystack in haystacks
+            if query_lower in haystack
+        ]
 
-        return {
+        return _ORJSONResponse({
             "markets": matching_markets,
             "count": len(matching_markets),
             "query": query
-        }
+        })
     except Exception as e:
-        return {"error": str(e), "markets": []}
+        return _ORJSONResponse({"error": str(e), "markets": []})
 
 
 @app.get("/api/debug/markets")
-def api_debug_markets(limit: int = 10):
+async def api_debug_markets(limit: int = 10):
     """Debug endpoint to see raw market data."""
     try:
-        markets = client.get_markets(limit=limit, status="open")
+        markets = await run_in_threadpool(get_markets_cached, limit, "open")
 
         # Filter by liquidity
         filtered_markets = bot.filter_markets_by_liquidity(markets)
 
-        return {
+        return _ORJSONResponse({
             "total_markets_fetched": len(markets),
             "markets_after_liquidity_filter": len(filtered_markets),
             "min_liquidity_threshold": bot.min_liquidity,
             "min_profit_per_day": bot.min_profit_per_day,
             "sample_markets": markets[:5] if markets else [],
             "sample_filtered": filtered_markets[:5] if filtered_markets else []
-        }
+        })
     except Exception as e:
-        return {"error": str(e)}
+        return _ORJSONResponse({"error": str(e)})
 